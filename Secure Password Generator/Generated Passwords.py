@@ -2,13 +2,142 @@ import os
 import sqlite3
 import json
 import hashlib
+import binascii
 import secrets
 import string
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Callable, Dict, List, Any, Tuple
+
+# orjson opsional, lebih cepat untuk ekspor json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# tabel kategori 256 byte: U=huruf besar, L=huruf kecil, D=digit, S=karakter khusus
+_CHAR_CATEGORY = bytes(
+    ord('U') if chr(b) in string.ascii_uppercase else
+    ord('L') if chr(b) in string.ascii_lowercase else
+    ord('D') if chr(b) in string.digits else
+    ord('S') if chr(b) in string.punctuation else
+    ord('.')
+    for b in range(256)
+)
+
+# rating kekuatan per skor kompleksitas (0-6)
+_STRENGTH_RATINGS = ('Lemah', 'Lemah', 'Lemah', 'Sedang', 'Sedang', 'Kuat', 'Kuat')
+
+class _RandomBytePool:
+    # penampung byte acak dari os.urandom, satu syscall per chunk_size byte
+    def __init__(self, chunk_size: int = 4096):
+        self.chunk_size = chunk_size
+        self._buffer = b''
+        self._pos = 0
+    
+    def read(self, n: int) -> bytes:
+        if len(self._buffer) - self._pos < n:
+            self._buffer = self._buffer[self._pos:] + os.urandom(max(n, self.chunk_size))
+            self._pos = 0
+        
+        data = self._buffer[self._pos:self._pos + n]
+        self._pos += n
+        return data
+    
+    def randbelow(self, n: int) -> int:
+        # rejection sampling, sama seperti secrets.randbelow
+        if n <= 0:
+            raise ValueError("Upper bound must be positive.")
+        bits = n.bit_length()
+        num_bytes = (bits + 7) // 8
+        while True:
+            value = int.from_bytes(self.read(num_bytes), 'big') >> (num_bytes * 8 - bits)
+            if value < n:
+                return value
+
+def _dump_json_row(row: Tuple) -> bytes:
+    # satu baris ekspor json, pakai orjson kalau tersedia
+    if orjson is not None:
+        return orjson.dumps(row)
+    # format sama dengan orjson: tanpa spasi, karakter non-ASCII apa adanya
+    return json.dumps(row, separators=(',', ':'), ensure_ascii=False).encode()
+
+def _char_table(alphabet: str) -> Tuple[bytes, bytes]:
+    # tabel translate byte -> karakter alfabet, plus byte yang ditolak
+    # supaya hasil modulo tetap seragam (tidak bias)
+    limit = 256 - 256 % len(alphabet)
+    table = bytes(ord(alphabet[b % len(alphabet)]) for b in range(256))
+    return table, bytes(range(limit, 256))
+
+_UPPERCASE_TABLE = _char_table(string.ascii_uppercase)
+_LOWERCASE_TABLE = _char_table(string.ascii_lowercase)
+_DIGIT_TABLE = _char_table(string.digits)
+_PUNCTUATION_TABLE = _char_table(string.punctuation)
+
+def _random_chars(
+    char_table: Tuple[bytes, bytes], 
+    count: int, 
+    read_bytes: Callable[[int], bytes] = secrets.token_bytes
+) -> bytes:
+    # ambil byte acak sekaligus lalu petakan ke alfabet lewat translate
+    table, reject = char_table
+    chars = b''
+    while len(chars) < count:
+        needed = count - len(chars)
+        chars += read_bytes(needed + needed // 4 + 2).translate(table, reject)
+    return chars[:count]
+
+# buffer kerja per thread untuk menyusun password, dipakai ulang antar password
+_SCRATCH = threading.local()
+_SCRATCH_MAX_CACHED = 1024
+
+def _scratch_buffer(length: int) -> bytearray:
+    # buffer di atas batas tidak disimpan, supaya thread tidak menahan memori besar
+    if length > _SCRATCH_MAX_CACHED:
+        return bytearray(length)
+    
+    buf = getattr(_SCRATCH, 'buf', None)
+    if buf is None or len(buf) < length:
+        buf = _SCRATCH.buf = bytearray(max(64, length))
+    return buf
+
+def _shuffle_bytes(buf: memoryview, randbelow: Callable[[int], int]) -> None:
+    # Fisher-Yates langsung di buffer, indeks dari randbelow yang tidak bias
+    for i in range(len(buf) - 1, 0, -1):
+        j = randbelow(i + 1)
+        buf[i], buf[j] = buf[j], buf[i]
+
+def _count_char_classes(buf: bytes) -> Tuple[int, int, int, int, int]:
+    # hitung (huruf besar, huruf kecil, digit, khusus, unik) dari byte password
+    categories = buf.translate(_CHAR_CATEGORY)
+    return (
+        categories.count(b'U'),
+        categories.count(b'L'),
+        categories.count(b'D'),
+        categories.count(b'S'),
+        len(set(buf))
+    )
 
 class PasswordVaultManager:
+    # SQL insert dibuat sekali, teks yang sama selalu kena cache statement sqlite3
+    _INSERT_PASSWORD_SQL = '''
+    INSERT INTO passwords (
+        name, password_hash, salt, 
+        complexity_score, strength_rating,
+        total_length, uppercase_count, 
+        lowercase_count, digit_count, 
+        special_char_count, entropy
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+    
+    # action selalu 'generated', jadi ditulis langsung di SQL tanpa binding
+    _INSERT_HISTORY_SQL = '''
+    INSERT INTO password_history (password_id, action) 
+    VALUES (?, 'generated')
+    '''
+    
     def __init__(self, vault_name: str = 'default_vault'):
 
         # konfigurasi direktori
@@ -20,8 +149,24 @@ class PasswordVaultManager:
         
         #inisialisasi database
         self.db_path = os.path.join(self.base_dir, 'password_vault.db')
+        
+        # satu koneksi dipakai ulang untuk semua operasi, dijaga lock
+        # (dibuka di _init_database supaya kesalahan tetap tercatat di log)
+        self._lock = threading.Lock()
         self._init_database()
     
+    def close(self):
+
+        # menutup koneksi database; objek koneksi tetap disimpan supaya
+        # pemakaian setelah close memunculkan sqlite3.ProgrammingError
+        conn = getattr(self, '_conn', None)
+        if conn is not None:
+            with self._lock:
+                conn.close()
+    
+    def __del__(self):
+        self.close()
+    
     def _setup_logging(self):
 
         log_dir = os.path.join(self.base_dir, 'logs')
@@ -36,14 +181,45 @@ class PasswordVaultManager:
             ]
         )
     
+    def _connect(self) -> sqlite3.Connection:
+
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=256)
+        
+        # pragma per koneksi, pasangan mode WAL dari _init_database
+        # (crash bisa menghilangkan transaksi terakhir, aman untuk log vault lokal)
+        try:
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA temp_store=MEMORY')
+            conn.execute('PRAGMA mmap_size=268435456')
+        except sqlite3.Error:
+            conn.close()
+            raise
+        return conn
+    
     def _init_database(self):
 
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+            self._conn = self._connect()
+        except sqlite3.Error as e:
+            logging.error(f"Kesalahan inisialisasi database: {e}")
+            
+            # koneksi pengganti yang sudah ditutup, jadi operasi berikutnya
+            # gagal dengan sqlite3.ProgrammingError dan tercatat seperti biasa
+            self._conn = sqlite3.connect(':memory:', check_same_thread=False)
+            self._conn.close()
+            return
+        
+        try:
+            with self._lock, self._conn as conn:
+                # mode WAL tersimpan permanen di file database
+                # (harus di luar transaksi, jadi tidak ikut script di bawah)
+                conn.execute('PRAGMA journal_mode=WAL')
                 
-                # tbel utama untuk password
-                cursor.execute('''
+                # semua DDL dalam satu transaksi
+                conn.executescript('''
+                BEGIN;
+                
+                -- tbel utama untuk password
                 CREATE TABLE IF NOT EXISTS passwords (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     name TEXT NOT NULL,
@@ -68,21 +244,24 @@ class PasswordVaultManager:
                     entropy REAL,
                     notes TEXT,
                     category TEXT
-                )
-                ''')
+                );
                 
-                # tabel riwayat penggunaan
-                cursor.execute('''
+                -- tabel riwayat penggunaan
                 CREATE TABLE IF NOT EXISTS password_history (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     password_id INTEGER,
                     action TEXT,
                     timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
                     FOREIGN KEY(password_id) REFERENCES passwords(id)
-                )
+                );
+                
+                -- index untuk pencarian nama dan riwayat
+                CREATE INDEX IF NOT EXISTS idx_passwords_name ON passwords(name);
+                CREATE INDEX IF NOT EXISTS idx_history_password_id ON password_history(password_id);
+                
+                COMMIT;
                 ''')
                 
-                conn.commit()
                 logging.info("Database vault diinisialisasi berhasil")
         
         except sqlite3.Error as e:
@@ -93,10 +272,12 @@ class PasswordVaultManager:
         num_passwords: int = 5, 
         min_length: int = 12, 
         max_length: int = 24,
-        complexity: str = 'balanced'
+        complexity: str = 'balanced',
+        workers: int = 1
     ) -> List[Dict[str, Any]]:
 
         generated_passwords = []
+        hashed = []
         
         # Definisi kompleksitas
         complexity_config = {
@@ -122,62 +303,154 @@ class PasswordVaultManager:
         
         current_config = complexity_config.get(complexity, complexity_config['balanced'])
         
-        for i in range(num_passwords):
-            # menentuka panjang password
-            length = secrets.randbelow(max_length - min_length + 1) + min_length
-            
-            # menghitung jumlah karakter
-            uppercase_count = int(length * current_config['uppercase_ratio'])
-            lowercase_count = int(length * current_config['lowercase_ratio'])
-            digit_count = int(length * current_config['digit_ratio'])
-            special_char_count = length - (uppercase_count + lowercase_count + digit_count)
-            
-            # membuat password
-            password_chars = (
-                [secrets.choice(string.ascii_uppercase) for _ in range(uppercase_count)] +
-                [secrets.choice(string.ascii_lowercase) for _ in range(lowercase_count)] +
-                [secrets.choice(string.digits) for _ in range(digit_count)] +
-                [secrets.choice(string.punctuation) for _ in range(special_char_count)]
-            )
-            
-            # mengacak urutan
-            secrets.SystemRandom().shuffle(password_chars)
-            password = ''.join(password_chars)
-            
-            # menganalisis password
-            password_details = self._analyze_password(password)
-            
-            # menyimpan ke database
-            password_id = self._save_password(
-                name=f"Generated-{i+1}",
-                password=password, 
-                details=password_details
+        # jumlah karakter per panjang, diisi saat panjang itu pertama kali muncul
+        char_counts_by_length = {}
+        
+        # bagi pekerjaan menjadi potongan, satu potongan per worker
+        chunk_size = -(-num_passwords // max(1, workers))
+        chunks = [
+            (start, min(chunk_size, num_passwords - start))
+            for start in range(0, num_passwords, chunk_size or 1)
+        ]
+        
+        def generate_chunk(chunk: Tuple[int, int]) -> Tuple[List[Dict[str, Any]], List[Tuple[str, str]]]:
+            return self._generate_chunk(
+                chunk[0], chunk[1], min_length, max_length, current_config, char_counts_by_length
             )
-            
-            # output
-            generated_passwords.append({
-                'id': password_id,
-                'name': f"Generated-{i+1}",
-                'password': password,
-                'details': password_details
-            })
+        
+        if workers > 1 and len(chunks) > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(generate_chunk, chunks))
+        else:
+            results = [generate_chunk(chunk) for chunk in chunks]
+        
+        for chunk_passwords, chunk_hashed in results:
+            generated_passwords.extend(chunk_passwords)
+            hashed.extend(chunk_hashed)
+        
+        rows = [
+            self._password_row(pwd['name'], pwd['details'], password_hash, salt)
+            for pwd, (password_hash, salt) in zip(generated_passwords, hashed)
+        ]
+        
+        # menyimpan ke database sekaligus
+        password_ids = self._save_passwords_bulk(rows)
+        for pwd, password_id in zip(generated_passwords, password_ids):
+            pwd['id'] = password_id
         
         return generated_passwords
     
+    def _char_counts(self, length: int, current_config: Dict[str, float]) -> Tuple[int, int, int, int]:
+
+        # menghitung jumlah karakter
+        uppercase_count = int(length * current_config['uppercase_ratio'])
+        lowercase_count = int(length * current_config['lowercase_ratio'])
+        digit_count = int(length * current_config['digit_ratio'])
+        special_char_count = length - (uppercase_count + lowercase_count + digit_count)
+        return uppercase_count, lowercase_count, digit_count, special_char_count
+    
+    def _generate_chunk(
+        self, 
+        start: int, 
+        count: int, 
+        min_length: int, 
+        max_length: int,
+        current_config: Dict[str, float],
+        char_counts_by_length: Dict[int, Tuple[int, int, int, int]]
+    ) -> Tuple[List[Dict[str, Any]], List[Tuple[str, str]]]:
+
+        generated_passwords = []
+        password_bytes = []
+        
+        # satu pool byte acak per potongan, tidak dibagi antar thread
+        random_pool = _RandomBytePool()
+        scratch = memoryview(_scratch_buffer(max_length))
+        
+        try:
+            for i in range(start, start + count):
+                # menentuka panjang password
+                length = random_pool.randbelow(max_length - min_length + 1) + min_length
+                
+                # jumlah karakter dari tabel, dihitung sekali per panjang
+                char_counts = char_counts_by_length.get(length)
+                if char_counts is None:
+                    char_counts = char_counts_by_length[length] = self._char_counts(length, current_config)
+                uppercase_count, lowercase_count, digit_count, special_char_count = char_counts
+                
+                # membuat password langsung di buffer kerja
+                password_chars = scratch[:length]
+                pos = 0
+                for char_table, char_count in (
+                    (_UPPERCASE_TABLE, uppercase_count),
+                    (_LOWERCASE_TABLE, lowercase_count),
+                    (_DIGIT_TABLE, digit_count),
+                    (_PUNCTUATION_TABLE, special_char_count)
+                ):
+                    password_chars[pos:pos + char_count] = _random_chars(char_table, char_count, random_pool.read)
+                    pos += char_count
+                
+                # mengacak urutan
+                _shuffle_bytes(password_chars, random_pool.randbelow)
+                password = bytes(password_chars)
+                password_bytes.append(password)
+                
+                # jumlah tiap jenis karakter sudah pasti dari tabel,
+                # cukup hitung karakter unik (_analyze_password untuk password dari luar)
+                password_details = self._rate_password({
+                    'total_length': length,
+                    'uppercase_count': uppercase_count,
+                    'lowercase_count': lowercase_count,
+                    'digit_count': digit_count,
+                    'special_char_count': special_char_count
+                }, len(set(password)))
+                
+                # output
+                generated_passwords.append({
+                    'id': None,
+                    'name': f"Generated-{i+1}",
+                    'password': password.decode('ascii'),
+                    'details': password_details
+                })
+        
+        finally:
+            # bersihkan sisa password dari buffer kerja, juga kalau terjadi error
+            scratch[:max_length] = bytes(max_length)
+            scratch.release()
+        
+        # hash password potongan ini dalam satu batch
+        return generated_passwords, self._hash_passwords(password_bytes)
+    
     def _analyze_password(self, password: str) -> Dict[str, Any]:
 
         # oerhitungan karakter
-        details = {
-            'total_length': len(password),
-            'uppercase_count': sum(1 for c in password if c.isupper()),
-            'lowercase_count': sum(1 for c in password if c.islower()),
-            'digit_count': sum(1 for c in password if c.isdigit()),
-            'special_char_count': sum(1 for c in password if c in string.punctuation)
-        }
+        if password.isascii():
+            # satu kali translate lewat tabel kategori, semua di C
+            upper, lower, digit, special, unique_chars = _count_char_classes(password.encode('ascii'))
+            details = {
+                'total_length': len(password),
+                'uppercase_count': upper,
+                'lowercase_count': lower,
+                'digit_count': digit,
+                'special_char_count': special
+            }
+        else:
+            details = {
+                'total_length': len(password),
+                'uppercase_count': sum(1 for c in password if c.isupper()),
+                'lowercase_count': sum(1 for c in password if c.islower()),
+                'digit_count': sum(1 for c in password if c.isdigit()),
+                # string.punctuation hanya ASCII, jadi byte UTF-8 lain tidak ikut terhitung
+                'special_char_count': password.encode('utf-8').translate(_CHAR_CATEGORY).count(b'S')
+            }
+            unique_chars = len(set(password))
         
+        return self._rate_password(details, unique_chars)
+    
+    def _rate_password(self, details: Dict[str, Any], unique_chars: int) -> Dict[str, Any]:
+
         # perhitungan entropi
-        unique_chars = len(set(password))
-        details['entropy'] = len(password) * (unique_chars / len(password)) ** 2
+        length = details['total_length']
+        details['entropy'] = length * (unique_chars / length) ** 2
         
         # skor kompleksitas
         complexity_score = sum([
@@ -190,80 +463,85 @@ class PasswordVaultManager:
         ])
         
         # rating kekuatan
-        if complexity_score <= 2:
-            strength_rating = 'Lemah'
-        elif complexity_score <= 4:
-            strength_rating = 'Sedang'
-        else:
-            strength_rating = 'Kuat'
+        strength_rating = _STRENGTH_RATINGS[complexity_score]
         
         details['complexity_score'] = complexity_score
         details['strength_rating'] = strength_rating
         
         return details
     
-    def _save_password(self, name: str, password: str, details: Dict[str, Any]) -> int:
+    def _hash_passwords(self, passwords: List[bytes]) -> List[Tuple[str, str]]:
 
-        try:
-            # generate salt nya
-            salt = secrets.token_hex(16)
+        hashed = []
+        for password in passwords:
+            # salt dalam bentuk hex (bytes), langsung bisa masuk ke hash
+            salt = binascii.hexlify(secrets.token_bytes(16))
             
-            # hash password pakai salt
-            password_hash = hashlib.sha256((password + salt).encode()).hexdigest()
-            
-            with sqlite3.connect(self.db_path) as conn:
+            # hash password pakai salt, tanpa menggabungkan dulu
+            # (hashlib.sha256 dari OpenSSL otomatis pakai SHA-NI kalau CPU mendukung)
+            digest = hashlib.sha256(password)
+            digest.update(salt)
+            hashed.append((digest.hexdigest(), salt.decode('ascii')))
+        
+        return hashed
+    
+    def _password_row(self, name: str, details: Dict[str, Any], password_hash: str, salt: str) -> Tuple:
+
+        # satu baris untuk tabel passwords
+        return (
+            name, 
+            password_hash, 
+            salt,
+            details['complexity_score'], 
+            details['strength_rating'],
+            details['total_length'],
+            details['uppercase_count'],
+            details['lowercase_count'], 
+            details['digit_count'], 
+            details['special_char_count'],
+            details['entropy']
+        )
+    
+    def _save_passwords_bulk(self, rows: List[Tuple]) -> List[int]:
+
+        if not rows:
+            return []
+        
+        try:
+            with self._lock, self._conn as conn:
                 cursor = conn.cursor()
                 
-                # menyimpn password
-                cursor.execute('''
-                INSERT INTO passwords (
-                    name, password_hash, salt, 
-                    complexity_score, strength_rating,
-                    total_length, uppercase_count, 
-                    lowercase_count, digit_count, 
-                    special_char_count, entropy
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    name, 
-                    password_hash, 
-                    salt,
-                    details['complexity_score'], 
-                    details['strength_rating'],
-                    details['total_length'],
-                    details['uppercase_count'],
-                    details['lowercase_count'], 
-                    details['digit_count'], 
-                    details['special_char_count'],
-                    details['entropy']
-                ))
+                # menyimpn semua password dalam satu transaksi
+                cursor.executemany(self._INSERT_PASSWORD_SQL, rows)
                 
-                password_id = cursor.lastrowid
+                # id AUTOINCREMENT berurutan selama transaksi ini memegang lock tulis
+                cursor.execute('SELECT last_insert_rowid()')
+                last_id = cursor.fetchone()[0]
+                password_ids = list(range(last_id - len(rows) + 1, last_id + 1))
                 
                 #catat riwayat
-                cursor.execute('''
-                INSERT INTO password_history (password_id, action) 
-                VALUES (?, ?)
-                ''', (password_id, 'generated'))
+                cursor.executemany(
+                    self._INSERT_HISTORY_SQL, 
+                    [(password_id,) for password_id in password_ids]
+                )
                 
                 conn.commit()
                 
-                logging.info(f"Password {name} disimpan dengan ID {password_id}")
+                for row, password_id in zip(rows, password_ids):
+                    logging.info(f"Password {row[0]} disimpan dengan ID {password_id}")
                 
-                return password_id
+                return password_ids
         
         except sqlite3.Error as e:
             logging.error(f"Kesalahan menyimpan password: {e}")
-            return -1
+            return [-1] * len(rows)
     
     def export_vault(self, format: str = 'json'):
 
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # mengambil semua password
-                cursor.execute('SELECT * FROM passwords')
-                passwords = cursor.fetchall()
+            with self._lock, self._conn as conn:
+                # mengambil semua password (dibaca bertahap, tidak pakai fetchall)
+                passwords = conn.execute('SELECT * FROM passwords')
                 
                 # menyiapkan direktori ekspor
                 export_dir = os.path.join(self.base_dir, 'exports')
@@ -274,8 +552,13 @@ class PasswordVaultManager:
                 
                 if format == 'json':
                     filepath = os.path.join(export_dir, f'vault_export_{timestamp}.json')
-                    with open(filepath, 'w') as f:
-                        json.dump(passwords, f, indent=4)
+                    with open(filepath, 'wb') as f:
+                        # tulis array json baris demi baris
+                        f.write(b'[')
+                        for index, row in enumerate(passwords):
+                            f.write(b',\n    ' if index else b'\n    ')
+                            f.write(_dump_json_row(row))
+                        f.write(b'\n]')
                 
                 elif format == 'csv':
                     import csv
@@ -299,6 +582,7 @@ class PasswordVaultManager:
 
 def main():
     # contoh penggunaanya
+    vault = None
     try:
         # buat vault baru
         vault = PasswordVaultManager(vault_name='personal_vault')
@@ -325,6 +609,10 @@ def main():
     
     except Exception as e:
         logging.error(f"Kesalahan utama: {e}")
+    
+    finally:
+        if vault is not None:
+            vault.close()
 
 if __name__ == "__main__":
     main()